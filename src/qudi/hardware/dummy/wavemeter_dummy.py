@@ -21,13 +21,16 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 
-import random
+import numpy as np
 from PySide2 import QtCore
 
 from qudi.core.configoption import ConfigOption
 from qudi.interface.wavemeter_interface import WavemeterInterface, OperationState, WavemeterErrorStatus
 from qudi.util.mutex import Mutex
 
+# speed of light in vacuum divided by 1 nm, to convert wavelengths in nm to frequencies in Hz
+_C_OVER_NM = 299792458.0 / 1e-9
+
 
 class HardwarePull(QtCore.QObject):
     """ Helper class for running the hardware communication in a separate
@@ -40,6 +43,19 @@ class HardwarePull(QtCore.QObject):
         # remember the reference to the parent class to access functions ad settings
         self._parentclass = parentclass
 
+        # random wavelength steps are drawn in batches and consumed one per timer tick
+        self._rng = np.random.default_rng()
+        self._random_steps = list()
+        self._random_step_index = 0
+
+        # Create the measurement timer only once. Being a child of this object it will follow it
+        # into the hardware thread upon moveToThread.
+        self.timer = QtCore.QTimer(self)
+        # default coarse timers may deviate from the (ms) interval by up to 5%
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.timeout.connect(self._measure_thread)
+
+    @QtCore.Slot(bool)
     def handle_timer(self, state_change):
         """ Threaded method that can be called by a signal from outside to start
             the timer.
@@ -48,12 +64,9 @@ class HardwarePull(QtCore.QObject):
         """
 
         if state_change:
-            self.timer = QtCore.QTimer()
-            self.timer.timeout.connect(self._measure_thread)
-            self.timer.start(self._parentclass._measurement_timing)
+            self.timer.start(int(round(self._parentclass._measurement_timing)))
         else:
-            if hasattr(self, 'timer'):
-                self.timer.stop()
+            self.timer.stop()
 
     def _measure_thread(self):
         """ The threaded method querying the data from the wavemeter. """
@@ -62,8 +75,12 @@ class HardwarePull(QtCore.QObject):
 
         # update as long as the status is busy
         if self._parentclass.module_state() == 'locked':
+            if self._random_step_index >= len(self._random_steps):
+                self._random_steps = self._rng.uniform(-range_step, range_step, 4096).tolist()
+                self._random_step_index = 0
             # get the current wavelength from the wavemeter
-            self._parentclass._current_wavelength += random.uniform(-range_step, range_step)
+            self._parentclass._current_wavelength += self._random_steps[self._random_step_index]
+            self._random_step_index += 1
 
 
 class WavemeterDummy(WavemeterInterface):
@@ -142,7 +159,7 @@ class WavemeterDummy(WavemeterInterface):
         Stops the Wavemeter from measuring and kills the thread that queries the data.
         """
         # check status just for a sanity check
-        if self.module_state() == 'idle' or self.module_state() == 'deactivated':
+        if self.module_state() in ('idle', 'deactivated'):
             self.log.warning('Wavemeter was already stopped, stopping it '
                     'anyway!')
         else:
@@ -154,11 +171,11 @@ class WavemeterDummy(WavemeterInterface):
         # Stop the actual wavemeter measurement
         self.log.info('stopping Wavemeter')
 
-    def get_current_wavelength(self):
-        return float(self._current_wavelength) * 1e-9
+    def get_current_wavelength(self) -> float:
+        return self._current_wavelength * 1e-9
 
     def get_current_frequency(self) -> float:
-        return 299792458.0 / self.get_current_wavelength()
+        return _C_OVER_NM / self._current_wavelength
 
     def get_timing(self):
         """ Get the timing of the internal measurement thread.
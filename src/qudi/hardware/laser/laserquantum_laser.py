@@ -31,6 +31,9 @@ from qudi.interface.simple_laser_interface import ControlMode, ShutterState, Las
 from dataclasses import dataclass, asdict
 import re
 
+_NON_NUMERIC_REGEX = re.compile(r'[^\d.]')
+
+
 class PSUTypes(Enum):
     """ LaserQuantum power supply types.
     """
@@ -367,7 +370,7 @@ class QL_common_command(Visa):
         na = self.read() #for empty strings''
 
     def _extract_num(self, string):
-        num = re.sub(r'[^\d.]', '', string)
+        num = _NON_NUMERIC_REGEX.sub('', string)
         return num
 
 
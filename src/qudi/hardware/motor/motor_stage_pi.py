@@ -244,7 +244,9 @@ class MotorStagePI(MotorInterface):
         timed_out = False
         t = 0
         t_start = time.perf_counter()
-        while not eval(condition_str):
+        # compile only once instead of on every poll
+        condition = compile(condition_str, '<condition>', 'eval')
+        while not eval(condition):
 
             t = time.perf_counter() - t_start
             if timeout_s >= 0 and t > timeout_s:
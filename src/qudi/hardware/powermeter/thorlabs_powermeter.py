@@ -29,6 +29,7 @@ If not, see <https://www.gnu.org/licenses/>.
 """
 
 import platform
+from typing import Optional
 from ctypes import (
     byref,
     c_bool,
@@ -40,8 +41,11 @@ from ctypes import (
     c_long,
     create_string_buffer,
     c_uint32,
+    POINTER,
 )
 
+import numpy as np
+
 from qudi.core.configoption import ConfigOption
 from qudi.interface.powermeter_interface import (
     PowerMeterInterface,
@@ -58,6 +62,24 @@ SET_VALUE = c_int16(0)
 MIN_VALUE = c_int16(1)
 MAX_VALUE = c_int16(2)
 
+# argument and return types of the used TLPM library functions
+_TLPM_PROTOTYPES = {
+    "TLPM_errorMessage": ([c_long, c_int, c_char_p], c_int),
+    "TLPM_findRsrc": ([c_long, POINTER(c_uint32)], c_int),
+    "TLPM_getRsrcName": ([c_long, c_int, c_char_p], c_int),
+    "TLPM_init": ([c_char_p, c_bool, c_bool, POINTER(c_long)], c_int),
+    "TLPM_close": ([c_long], c_int),
+    "TLPM_measPower": ([c_long, POINTER(c_double)], c_int),
+    "TLPM_getWavelength": ([c_long, c_int16, POINTER(c_double)], c_int),
+    "TLPM_setWavelength": ([c_long, c_double], c_int),
+    "TLPM_getPowerRange": ([c_long, c_int16, POINTER(c_double)], c_int),
+    "TLPM_setPowerRange": ([c_long, c_double], c_int),
+    "TLPM_getPowerAutorange": ([c_long, POINTER(c_int16)], c_int),
+    "TLPM_setPowerAutoRange": ([c_long, c_int16], c_int),
+    "TLPM_getInputFilterState": ([c_long, POINTER(c_int16)], c_int),
+    "TLPM_setInputFilterState": ([c_long, c_int16], c_int),
+}
+
 
 class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
     """Hardware module for Thorlabs powermeter using the TLPM library.
@@ -72,10 +94,15 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
             # The module logs an info message with the addresses of all available powermeters upon activation.
             address: 'USB0::0x1313::0x8078::P0012345::INSTR'
             wavelength: 940.0
+            # Keep the connection to the powermeter open while the channel is inactive (default).
+            # Set to False to release the device for other software while inactive, at the cost
+            # of a full re-initialization on every activation.
+            keep_connection_open: True
     """
 
     _address: str = ConfigOption("address", missing="warn")
     _wavelength: float = ConfigOption("wavelength", default=None, missing="warn")
+    _keep_connection_open: bool = ConfigOption("keep_connection_open", default=True)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -83,17 +110,25 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
         self._constraints = None
         self._pm_constrains = None
         self._is_active = False
+        self._is_connected = False
 
         self._dll = None
+        self._meas_power = None
+        # reusable output buffers for the frequently polled measurement values
+        self._power_buffer = c_double()
+        self._power_buffer_ref = byref(self._power_buffer)
+        self._wavelength_buffer = c_double()
+        self._wavelength_buffer_ref = byref(self._wavelength_buffer)
         self._devSession = c_long()
         self._devSession.value = 0
         self._device_address = None
+        self._device_address_buffer = None
 
     def _test_for_error(self, status):
         if status < 0:
             msg = create_string_buffer(1024)
             self._dll.TLPM_errorMessage(self._devSession, c_int(status), msg)
-            self.log.exception(c_char_p(msg.raw).value)
+            self.log.exception(msg.value.decode())
             raise ValueError
 
     def on_activate(self):
@@ -114,6 +149,13 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
             )
             raise e
 
+        # declare function prototypes once so ctypes does not have to guess argument conversions
+        for name, (argtypes, restype) in _TLPM_PROTOTYPES.items():
+            func = getattr(self._dll, name)
+            func.argtypes = argtypes
+            func.restype = restype
+        self._meas_power = self._dll.TLPM_measPower
+
         # get list of available power meters
         device_count = c_uint32()
         result = self._dll.TLPM_findRsrc(self._devSession, byref(device_count))
@@ -127,7 +169,7 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
                 self._devSession, c_int(i), resource_name
             )
             self._test_for_error(result)
-            available_power_meters.append(c_char_p(resource_name.raw).value.decode())
+            available_power_meters.append(resource_name.value.decode())
 
         self.log.info(f"Available power meters: {available_power_meters}")
 
@@ -148,6 +190,7 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
             else:
                 self.log.exception(f"No powermeter with address {self._address} found.")
                 raise ValueError
+        self._device_address_buffer = create_string_buffer(self._device_address.encode("utf-8"))
 
         # try connecting to the powermeter
         try:
@@ -194,13 +237,16 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
         if self._wavelength is not None:
             self.set_wavelength(self._wavelength)
 
-        # close connection since default state is not active
-        self._close_powermeter()
+        # default state is not active
+        if not self._keep_connection_open:
+            self._close_powermeter()
         self._is_active = False
 
     def on_deactivate(self):
         """Stops the module"""
         self.set_activity_state(self._channel_name, False)
+        if self._is_connected:
+            self._close_powermeter()
 
     @property
     def process_values(self):
@@ -227,11 +273,11 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
                 f"Invalid channel name. Only valid channel is: {self._channel_name}"
             )
         if active != self._is_active:
-            self._is_active = active
-            if active:
+            if active and not self._is_connected:
                 self._init_powermeter()
-            else:
+            elif not active and not self._keep_connection_open:
                 self._close_powermeter()
+            self._is_active = active
 
     def get_activity_state(self, channel):
         """Get activity state for given channel.
@@ -268,13 +314,13 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
             raise AssertionError(
                 f"Invalid channel name. Only valid channel is: {self._channel_name}"
             )
-        if not self.get_activity_state(self._channel_name):
+        if not self._is_active:
             raise AssertionError(
                 "Channel is not active. Activate first before getting process value."
             )
         return self._get_power()
 
-    def get_power(self):
+    def get_power(self) -> float:
         """
         Get the measured power from the powermeter
 
@@ -283,6 +329,22 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
         self._check_enabled()
         return self._get_power()
 
+    def get_power_batch(self, n: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get n consecutive power measurements from the powermeter
+
+        @param int n: Number of measurements
+        @param numpy.ndarray out: Optional float64 array of length n to write the measurements into
+
+        @return numpy.ndarray: Measured powers in Watts
+        """
+        out = self._get_batch_output(n, out)
+        self._check_enabled()
+        get_power = self._get_power
+        for i in range(n):
+            out[i] = get_power()
+        return out
+
     def get_wavelength(self) -> float:
         """
         Get the currently set wavelength of the powermeter
@@ -290,12 +352,11 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
         @return float: The set wavelength
         """
         self._check_enabled()
-        wavelength = c_double()
         result = self._dll.TLPM_getWavelength(
-            self._devSession, SET_VALUE, byref(wavelength)
+            self._devSession, SET_VALUE, self._wavelength_buffer_ref
         )
         self._test_for_error(result)
-        return wavelength.value
+        return self._wavelength_buffer.value
 
     def set_wavelength(self, wavelength: float):
         """
@@ -306,7 +367,7 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
         """ Set the new measurement wavelength in nanometers """
         self._check_enabled()
         try:
-            self.pm_constraints.wavelength.check_value_range(wavelength)
+            self._pm_constrains.wavelength.check_value_range(wavelength)
         except ValueError as e:
             self.log.exception("Wavelength out of bounds.")
             raise e
@@ -334,7 +395,7 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
         """
         self._check_enabled()
         try:
-            self.pm_constraints.power_range.check_value_range(limit)
+            self._pm_constrains.power_range.check_value_range(limit)
         except ValueError as e:
             self.log.exception("Power limit out of bounds.")
             raise e
@@ -388,7 +449,7 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
 
         @return PowerMeterConstraints
         """
-        return self._pm_constrains.copy()
+        return self._pm_constrains
 
     def _init_powermeter(self, reset=False):
         """
@@ -396,31 +457,33 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
         :param reset: whether to reset the powermeter upon connection
         """
         id_query, reset_device = c_bool(True), c_bool(reset)
-        address = create_string_buffer(self._device_address.encode("utf-8"))
         result = self._dll.TLPM_init(
-            address, id_query, reset_device, byref(self._devSession)
+            self._device_address_buffer, id_query, reset_device, byref(self._devSession)
         )
         try:
             self._test_for_error(result)
         except ValueError as e:
             self.log.exception("Connection to powermeter was unsuccessful.")
             raise e
+        self._is_connected = True
 
     def _close_powermeter(self):
         """Close connection to powermeter."""
         result = self._dll.TLPM_close(self._devSession)
+        self._is_connected = False
         self._test_for_error(result)
 
-    def _get_power(self):
+    def _get_power(self) -> float:
         """Return the power reading from the power meter"""
-        power = c_double()
-        result = self._dll.TLPM_measPower(self._devSession, byref(power))
-        try:
-            self._test_for_error(result)
-        except ValueError as e:
-            self.log.exception("Getting power from powermeter was unsuccessful.")
-            raise e
-        return power.value
+        result = self._meas_power(self._devSession, self._power_buffer_ref)
+        # only leave the fast path if the driver reports an error
+        if result < 0:
+            try:
+                self._test_for_error(result)
+            except ValueError as e:
+                self.log.exception("Getting power from powermeter was unsuccessful.")
+                raise e
+        return self._power_buffer.value
 
     def _get_wavelength_range(self):
         """Return the measurement wavelength range of the power meter in nanometers"""
@@ -438,7 +501,7 @@ class ThorlabsPowermeter(ProcessValueInterface, PowerMeterInterface):
         return wavelength_min.value, wavelength_max.value
 
     def _check_enabled(self):
-        if not self.get_enabled():
+        if not self._is_active:
             raise AssertionError(
                 "Power meter is not active. Activate by calling 'set_enabled(True)'"
             )
@@ -24,10 +24,13 @@ You should have received a copy of the GNU Lesser General Public License along w
 If not, see <https://www.gnu.org/licenses/>.
 """
 import time
+import ctypes
 
 import numpy as np
+from PySide2 import QtCore
 
 from qudi.interface.spectrometer_interface import SpectrometerInterface
+from qudi.util.mutex import RecursiveMutex
 
 import os, glob, string
 import sys
@@ -39,7 +42,36 @@ import clr
 import System
 from System import EventHandler, EventArgs
 import System.Collections.Generic as col
-from System.Threading import AutoResetEvent
+from System.Runtime.InteropServices import GCHandle, GCHandleType
+from System.Threading import ManualResetEventSlim
+
+# numpy dtypes of the LightField ImageDataFormat members
+_FRAME_DTYPES = {
+    "MonochromeUnsigned16": np.uint16,
+    "MonochromeUnsigned32": np.uint32,
+    "MonochromeFloating32": np.float32,
+}
+# time in seconds to wait for an acquisition on top of the total exposure time before giving up
+_ACQUISITION_TIMEOUT_MARGIN = 10
+
+
+def _copy_net_array(source, destination: np.ndarray) -> None:
+    """Copy the memory of a .NET array into a numpy array of matching dtype and size."""
+    if source.Length != destination.size:
+        raise ValueError(
+            f"Size of .NET array ({source.Length}) does not match the destination size "
+            f"({destination.size})"
+        )
+    # pin the .NET array so the garbage collector can not move it during the copy
+    handle = GCHandle.Alloc(source, GCHandleType.Pinned)
+    try:
+        ctypes.memmove(
+            destination.ctypes.data,
+            handle.AddrOfPinnedObject().ToInt64(),
+            destination.nbytes,
+        )
+    finally:
+        handle.Free()
 
 
 class LFImageMode(Enum):
@@ -56,6 +88,10 @@ class ShutterTimingMode(Enum):
     AlwaysOpen = 3
 
 
+_SHUTTER_MODES = frozenset(ShutterTimingMode.__members__)
+_OPEN_SHUTTER_MODES = frozenset(("AlwaysOpen", "Normal"))
+
+
 class Lightfield(SpectrometerInterface):
     """Control Princeton Instruments Lightfield from Qudi.
 
@@ -69,6 +105,9 @@ class Lightfield(SpectrometerInterface):
 
     """
 
+    # emits the spectrum requested by start_recording_spectrum as numpy array (2,N)
+    sigSpectrumRecorded = QtCore.Signal(object)
+
     def on_activate(self):
         """Activate module.
 
@@ -111,9 +150,32 @@ class Lightfield(SpectrometerInterface):
         self.spec_setting = SpectrometerSettings
         self.exp_setting = ExperimentSettings
         self.file_manager = self.app.FileManager
-        self.acquireCompleted = AutoResetEvent(False)
+        self.acquireCompleted = ManualResetEventSlim(False)
+        # frames are written alternately into these buffers, so that the last complete frame
+        # stays untouched while the next one is received during streaming
+        self._frame_buffers = [np.empty(0, dtype=np.uint16), np.empty(0, dtype=np.uint16)]
+        self._back_buffer_index = 0
+        self._streaming = False
+        self._emit_spectrum = False
+        # serializes starting and stopping acquisitions with the completion callback
+        self._acquisition_lock = RecursiveMutex()
+        # calibration of the current experiment, invalidated by any setting change
+        self.calibration = None
+        self.calerrors = None
+        self.intcal = None
+        self._pixel_count = None
+        self._wavelengths = None
+        self._spectrum = None
+        # last known shutter timing mode, invalidated by any setting change
+        self._shutter_mode = None
+        # result of Experiment.Exists for every setting accessed so far
+        self._setting_exists = dict()
+        # last known exposure time in seconds, invalidated by any setting change
+        self._exposure_time = None
 
         self.exposure_time_limits = self.get_minimum_and_maximum_exposure_time()
+        self._exposure_time_min = self.exposure_time_limits["min"]
+        self._exposure_time_max = self.exposure_time_limits["max"]
 
         self.exp.ExperimentCompleted += EventHandler(self._set_acquisition_complete)
         self.exp.ImageDataSetReceived += EventHandler(self._frame_callback)
@@ -127,6 +189,8 @@ class Lightfield(SpectrometerInterface):
 
     def on_deactivate(self):
         """Deactivate module."""
+        if self._streaming:
+            self.stop_streaming()
         self.app.UserInteractionManager.SuppressUserInteraction = False
         # disconnect event handlers
         self.exp.ExperimentCompleted -= EventHandler(self._set_acquisition_complete)
@@ -138,29 +202,38 @@ class Lightfield(SpectrometerInterface):
         if hasattr(self, "au"):
             del self.au
 
-    def _set_value(self, setting, value):
-        if self.exp.Exists(setting):
+    def _exists(self, setting) -> bool:
+        try:
+            return self._setting_exists[setting]
+        except KeyError:
+            exists = self._setting_exists[setting] = self.exp.Exists(setting)
+            return exists
+
+    def _set_value(self, setting, value) -> bool:
+        if self._exists(setting):
             self.exp.SetValue(setting, value)
+            return True
+        return False
 
     def _get_value(self, setting):
-        if self.exp.Exists(setting):
+        if self._exists(setting):
             return self.exp.GetValue(setting)
 
     def get_minimum_and_maximum_exposure_time(self) -> dict:
         """Get the minimum and maximum exposure time in seconds"""
-        min = self.exp.GetMaximumRange(
-            self.cam_setting.ShutterTimingExposureTime
-        ).Minimum
-        max = self.exp.GetMaximumRange(
-            self.cam_setting.ShutterTimingExposureTime
-        ).Maximum
-        return dict(min=min, max=max)
+        # LightField handles the exposure time in milliseconds
+        exposure_range = self.exp.GetMaximumRange(self.cam_setting.ShutterTimingExposureTime)
+        return dict(min=exposure_range.Minimum / 1e3, max=exposure_range.Maximum / 1e3)
 
     # Callbacks
     def _setting_changed_callback(self, sender, args):
         """Lightfieldsettings changed."""
         # TODO: This should can be used to update the GUI
-        pass
+        self._pixel_count = None
+        self._wavelengths = None
+        self._spectrum = None
+        self._shutter_mode = None
+        self._exposure_time = None
 
     def _frame_callback(self, sender, args):
         """A frame/spectrum was recorded."""
@@ -169,18 +242,37 @@ class Lightfield(SpectrometerInterface):
         dataSet = args.ImageDataSet
         frame = dataSet.GetFrame(0, 0)
         arr = frame.GetData()
-        dims = [frame.Width, frame.Height]
+        size = arr.Length
+        dtype = _FRAME_DTYPES[frame.Format.ToString()]
+
+        buffer = self._frame_buffers[self._back_buffer_index]
+        if buffer.size != size or buffer.dtype != dtype:
+            buffer = np.empty(size, dtype=dtype)
+            self._frame_buffers[self._back_buffer_index] = buffer
+        _copy_net_array(arr, buffer)
 
-        self.lastframe = list(arr)
+        self.lastframe = buffer
+        self._back_buffer_index ^= 1
 
     def _set_acquisition_complete(self, sender, args):
         """A frame/spectrum was recorded."""
-        self.acquireCompleted.Set()
-        self.module_state.unlock()
+        with self._acquisition_lock:
+            self.acquireCompleted.Set()
+            if self._streaming:
+                # let the camera integrate the next frame while the last one is processed
+                self._restart_streaming()
+            elif self.module_state() == "locked":
+                # the module is already unlocked if the acquisition was stopped
+                self.module_state.unlock()
+            emit_spectrum = self._emit_spectrum
+            self._emit_spectrum = False
+        if emit_spectrum:
+            # do not touch the buffer of record_spectrum from this thread
+            self.sigSpectrumRecorded.emit(self._assemble_spectrum(reuse_buffer=False))
 
     def get_experiment_list(self):
         """Get experiments configured in Lightfield"""
-        return [savedexperiment for savedexperiment in self.exp.GetSavedExperiments()]
+        return list(self.exp.GetSavedExperiments())
 
     def save_experiment(self, experiment_name: str):
         """Saves experiments configured in Lightfield"""
@@ -190,26 +282,76 @@ class Lightfield(SpectrometerInterface):
         """Open experiments configured in Lightfield"""
         if self.exp.Exists(experiment_name):
             self.exp.Load(experiment_name)
+            # the new experiment may use different devices
+            self._setting_exists.clear()
         else:
             raise ValueError(f"Experiment {experiment_name} not found")
 
-    def _start_acquire(self):
-        """Acquire a frame/spectrum"""
+    def _update_calibration(self) -> tuple:
+        """Read the calibration of the current experiment unless the cached one is still valid.
+        The cache may be invalidated from the Lightfield thread at any time, so callers must use
+        the returned values instead of reading the attributes again.
+
+        @return tuple: column calibration and number of pixels
+        """
+        calibration = self.calibration
+        pixel_count = self._pixel_count
+        if pixel_count is None:
+            calibration = self.exp.SystemColumnCalibration
+            pixel_count = calibration.Length
+            self.calerrors = self.exp.SystemColumnCalibrationErrors
+            self.intcal = self.exp.SystemIntensityCalibration
+            self.calibration = calibration
+            self._pixel_count = pixel_count
+        return calibration, pixel_count
+
+    def _start_acquire(self, wait: bool = True, emit_spectrum: bool = False) -> bool:
+        """Acquire a frame/spectrum
+
+        @param bool wait: Block until the acquisition is complete
+        @param bool emit_spectrum: Emit the spectrum by sigSpectrumRecorded once it is complete
+
+        @return bool: True if the acquisition has been started by this call
+        """
+        if self._streaming:
+            self.log.warning("Unable to start a acquisition while streaming.")
+            return False
+
+        # stop without holding the lock, so that the completion callback of the stopped
+        # acquisition can finish before the new acquisition is started
         if self.is_running:
             self.stop_aquisition()
             time.sleep(0.2)
 
-        if self.module_state() == "locked":
-            self.log.warning("Unable to start a acquisition. It is already running.")
-        else:
-            self.calibration = self.exp.SystemColumnCalibration
-            self.calerrors = self.exp.SystemColumnCalibrationErrors
-            self.intcal = self.exp.SystemIntensityCalibration
-            if self.exp.IsReadyToRun:
-                self.module_state.lock()
-                self.exp.Acquire()
-                # Wait for acquisition to complete
-                self.acquireCompleted.WaitOne()
+        with self._acquisition_lock:
+            if self.module_state() == "locked" or self.is_running:
+                self.log.warning("Unable to start a acquisition. It is already running.")
+                return False
+
+            self._update_calibration()
+            if not self.exp.IsReadyToRun:
+                return False
+            self.module_state.lock()
+            self.acquireCompleted.Reset()
+            self._emit_spectrum = emit_spectrum
+            self.exp.Acquire()
+
+        if wait:
+            self._wait_for_acquisition()
+        return True
+
+    def _wait_for_acquisition(self):
+        """Block until the running acquisition is complete"""
+        # an acquisition exposes all frames to store, the margin covers readout and overhead
+        frames = self.number_of_frames
+        frames = max(int(frames), 1) if frames is not None else 1
+        timeout = frames * self.exposure_time + _ACQUISITION_TIMEOUT_MARGIN
+        if not self.acquireCompleted.Wait(int(timeout * 1e3)):
+            if self._streaming:
+                self.stop_streaming()
+            else:
+                self.stop_aquisition()
+            raise TimeoutError(f"Lightfield acquisition did not complete within {timeout:.3g} s")
 
     # write a function that save folder path and file name
     def set_file_directory(self, folder_path: str, file_name: str):
@@ -236,89 +378,151 @@ class Lightfield(SpectrometerInterface):
         """Get the shutter mode:
         Normal, AlwaysClosed, AlwaysOpen
         """
-        shutter_mode = self._get_value(self.cam_setting.ShutterTimingMode).ToString()
-        return shutter_mode
+        if self._shutter_mode is None:
+            self._shutter_mode = self._get_value(self.cam_setting.ShutterTimingMode).ToString()
+        return self._shutter_mode
 
     @shutter.setter
     def shutter(self, shutter_mode: str):
-        if shutter_mode not in ShutterTimingMode.__members__:
+        if shutter_mode not in _SHUTTER_MODES:
             raise ValueError()
         else:
-            self._set_value(self.cam_setting.ShutterTimingMode, shutter_mode)
+            if self._set_value(self.cam_setting.ShutterTimingMode, shutter_mode):
+                self._shutter_mode = shutter_mode
 
     @property
     def shutter_open(self) -> bool:
-        if self.shutter == "AlwaysOpen" or self.shutter == "Normal":
-            return True
-        else:
-            return False
+        return self.shutter in _OPEN_SHUTTER_MODES
 
     @shutter_open.setter
     def shutter_open(self, value: bool):
         if value:
-            self.shutter = str(ShutterTimingMode.AlwaysOpen.name)
+            self.shutter = ShutterTimingMode.AlwaysOpen.name
         else:
-            self.shutter = str(ShutterTimingMode.AlwaysClosed.name)
+            self.shutter = ShutterTimingMode.AlwaysClosed.name
 
     @property
     def pixels_in_spectrum(self):
         """Length is the number of pixels in the spectrum."""
-        return self.exp.SystemColumnCalibration.Length
+        return self._update_calibration()[1]
 
     @property
     def exposure_time(self) -> float:
         """Get the exposure time in seconds"""
-
-        value_in_milliseconds = self._get_value(
-            self.cam_setting.ShutterTimingExposureTime
-        )
-
-        return float(value_in_milliseconds / 1e3)
+        if self._exposure_time is None:
+            value_in_milliseconds = self._get_value(
+                self.cam_setting.ShutterTimingExposureTime
+            )
+            self._exposure_time = float(value_in_milliseconds / 1e3)
+        return self._exposure_time
 
     @exposure_time.setter
     def exposure_time(self, value: float):
-        if (
-            value < self.exposure_time_limits["min"]
-            or value > self.exposure_time_limits["max"]
-        ):
+        if not self._exposure_time_min <= value <= self._exposure_time_max:
             raise ValueError(
-                f"Exposure time {value} not in range [{self.exposure_time_limits['min']}, {self.exposure_time_limits['max']}]"
+                f"Exposure time {value} not in range [{self._exposure_time_min}, {self._exposure_time_max}]"
             )
 
-        value_in_milliseconds = value * 1e3
-
-        self._set_value(
-            self.cam_setting.ShutterTimingExposureTime, value_in_milliseconds
-        )
+        self._set_value(self.cam_setting.ShutterTimingExposureTime, value * 1e3)
+        # read back the value actually applied by Lightfield on the next access
+        self._exposure_time = None
 
     def record_spectrum(self) -> np.ndarray:
-        """Record a single spectrum and return it as a numpy array (2,N) where N is the number of pixels"""
-        self._start_acquire()
+        """Record a single spectrum and return it as a numpy array (2,N) where N is the number of pixels.
+        The returned array is reused and overwritten by the next call.
+        """
+        if self._streaming:
+            # wait for the next frame of the running acquisition
+            self._wait_for_acquisition()
+            self.acquireCompleted.Reset()
+        else:
+            self._start_acquire()
+
+        return self._assemble_spectrum()
+
+    def start_recording_spectrum(self):
+        """Start recording a single spectrum and return immediately. The spectrum is emitted by
+        sigSpectrumRecorded once the acquisition is complete.
+        """
+        self._start_acquire(wait=False, emit_spectrum=True)
 
-        data = np.zeros((2, self.pixels_in_spectrum))
-        data[0, :] = self.get_wavelength_array()
+    def _assemble_spectrum(self, reuse_buffer: bool = True) -> np.ndarray:
+        """Write the last frame into a (2,N) spectrum array and return it
+
+        @param bool reuse_buffer: Write into the buffer reused by record_spectrum instead of a new array
+        """
+        spectrum = self._spectrum if reuse_buffer else None
+        if spectrum is None:
+            wavelengths = self.get_wavelength_array()
+            spectrum = np.empty((2, wavelengths.size))
+            spectrum[0, :] = wavelengths
+            if reuse_buffer:
+                self._spectrum = spectrum
         if self.exp.ExperimentCompleted:
-            data[1, :] = np.asarray(self.lastframe)
+            np.copyto(spectrum[1, :], self.lastframe, casting="unsafe")
+        else:
+            spectrum[1, :] = 0
 
-        return data
+        return spectrum
 
     def get_wavelength_array(self) -> np.ndarray:
         """Get the wavelength array in meters"""
-        wl_list = [
-            float(self.exp.SystemColumnCalibration.Get(i)) * 1e-9
-            for i in range(0, self.pixels_in_spectrum)
-        ]
-        return np.asarray(wl_list)
+        wavelengths = self._wavelengths
+        if wavelengths is None:
+            calibration, pixel_count = self._update_calibration()
+            wavelengths = np.empty(pixel_count, dtype=np.float64)
+            _copy_net_array(calibration, wavelengths)
+            wavelengths *= 1e-9
+            wavelengths.flags.writeable = False
+            self._wavelengths = wavelengths
+        return wavelengths
+
+    def start_streaming(self):
+        """Acquire spectra continuously. While streaming, record_spectrum returns the next
+        spectrum without starting a new acquisition.
+        """
+        with self._acquisition_lock:
+            if self.module_state() == "locked":
+                self.log.warning("Unable to start streaming. An acquisition is already running.")
+                return
+            self._update_calibration()
+            if self.exp.IsReadyToRun:
+                self._streaming = True
+                self.module_state.lock()
+                self.acquireCompleted.Reset()
+                self.exp.Acquire()
+
+    def stop_streaming(self):
+        """Stop acquiring spectra continuously"""
+        with self._acquisition_lock:
+            self._streaming = False
+            self.stop_aquisition()
+
+    def _restart_streaming(self):
+        """Start the next acquisition while streaming. Stops streaming if that is not possible."""
+        try:
+            if not self.exp.IsReadyToRun:
+                raise RuntimeError("Lightfield experiment is not ready to run.")
+            self.exp.Acquire()
+        except Exception:
+            self.log.exception("Unable to start the next acquisition. Streaming stopped.")
+            self._streaming = False
+            # wake up a record_spectrum call waiting for the next frame
+            self.acquireCompleted.Set()
+            if self.module_state() == "locked":
+                self.module_state.unlock()
 
     @property
     def is_running(self):
         return self.exp.IsRunning
 
     def stop_aquisition(self):
-        if self.is_running:
-            self.exp.Stop()
+        with self._acquisition_lock:
+            self._emit_spectrum = False
+            if self.is_running:
+                self.exp.Stop()
 
-        if self.module_state() == "locked":
-            self.module_state.unlock()
+            if self.module_state() == "locked":
+                self.module_state.unlock()
 
         return
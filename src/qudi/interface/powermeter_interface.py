@@ -21,7 +21,7 @@ top-level directory of this distribution and at <https://github.com/Ulm-IQO/qudi
 """
 
 from abc import abstractmethod
-from typing import Union, Mapping
+from typing import Union, Mapping, Optional
 from enum import Enum
 
 import numpy as np
@@ -42,6 +42,8 @@ _SD = Union[ScalarConstraint, Mapping]
 
 
 class PowerMeterConstraints:
+    __slots__ = ('wavelength', 'power_range', 'power_limit_modes', 'power_range_mode_default')
+
     def __init__(self, wavelength: _SD = None, power_range: _SD = None,
                  power_limit_modes: tuple[PowerLimitMode, ...] = None,
                  power_range_mode_default: PowerLimitMode = None):
@@ -71,7 +73,11 @@ class PowerMeterConstraints:
             self.power_range_mode_default = self.power_limit_modes[0]
 
     def copy(self):
-        return PowerMeterConstraints(**vars(self))
+        # the attributes have already been validated, so skip __init__
+        new = PowerMeterConstraints.__new__(PowerMeterConstraints)
+        for attr in self.__slots__:
+            setattr(new, attr, getattr(self, attr))
+        return new
 
 
 class PowerMeterInterface(Base):
@@ -80,7 +86,7 @@ class PowerMeterInterface(Base):
     """
 
     @abstractmethod
-    def get_power(self):
+    def get_power(self) -> float:
         """
         Get the measured power from the powermeter
 
@@ -88,6 +94,38 @@ class PowerMeterInterface(Base):
         """
         pass
 
+    def get_power_batch(self, n: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get n consecutive power measurements from the powermeter. Hardware that can acquire several
+        samples in a single transaction should override this default implementation.
+
+        @param int n: Number of measurements
+        @param numpy.ndarray out: Optional float64 array of length n to write the measurements into
+
+        @return numpy.ndarray: Measured powers in Watts
+        """
+        out = self._get_batch_output(n, out)
+        for i in range(n):
+            out[i] = self.get_power()
+        return out
+
+    @staticmethod
+    def _get_batch_output(n: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Check the output array passed to get_power_batch or create a new one if none is given.
+
+        @param int n: Number of measurements
+        @param numpy.ndarray out: Optional output array to check
+
+        @return numpy.ndarray: float64 array of shape (n,) to write the measurements into
+        """
+        if out is None:
+            return np.empty(n, dtype=np.float64)
+        if out.shape != (n,) or out.dtype != np.float64:
+            raise ValueError(f'Output array must be a float64 array of shape ({n:d},), '
+                             f'got {out.dtype} array of shape {out.shape}.')
+        return out
+
     @abstractmethod
     def get_wavelength(self) -> float:
         """
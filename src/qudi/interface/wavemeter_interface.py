@@ -22,6 +22,10 @@ If not, see <https://www.gnu.org/licenses/>.
 
 from abc import abstractmethod
 from enum import IntEnum
+from typing import Optional
+
+import numpy as np
+
 from qudi.core.module import Base
 
 
@@ -70,6 +74,25 @@ class WavemeterInterface(Base):
         """
         pass
 
+    def get_current_wavelength_batch(self, n: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        This method returns n consecutive wavelength readings. Hardware that can read several
+        samples in a single transaction should override this default implementation.
+
+        @param n: Number of readings
+        @param out: Optional float64 array of length n to write the readings into
+
+        @return: the wavelengths in m
+        """
+        if out is None:
+            out = np.empty(n, dtype=np.float64)
+        elif out.shape != (n,) or out.dtype != np.float64:
+            raise ValueError(f'Output array must be a float64 array of shape ({n:d},), '
+                             f'got {out.dtype} array of shape {out.shape}.')
+        for i in range(n):
+            out[i] = self.get_current_wavelength()
+        return out
+
     @abstractmethod
     def get_current_frequency(self) -> float:
         """
@@ -50,7 +50,8 @@ class RegionOfInterest:
     """
     Class containing the general information about a specific region of interest (ROI),
     e.g. the sample drift history and the corresponding confocal image.
-    Each individual point of interest (POI) will be represented as a PointOfInterest instance.
+    The points of interest (POI) are stored as a list of names and a contiguous array of anchors.
+    PointOfInterest instances are only used to add POIs and for (de-)serialization.
     The origin af a new ROI is always defined as (0,0,0) initially.
     Sample shifts will cause this origin to move to a different coordinate.
     The anchors of each individual POI is given relative to the initial ROI origin (even if added later).
@@ -62,8 +63,10 @@ class RegionOfInterest:
         # Remember the creation time for drift history timestamps
         self._creation_time = None
         # Keep track of the global position history relative to the initial position (sample drift).
-        # Each item is a float[4] array containing (time_in_s, x, y, z)
+        # Preallocated float[N][4] buffer with each row containing (time_in_s, x, y, z). Only the
+        # first self._pos_history_size rows are valid, the buffer capacity grows by doubling.
         self._pos_history = None
+        self._pos_history_size = 0
         # Optional scan image associated with this ROI
         self._scan_image = None
         # Optional initial scan image extent.
@@ -73,10 +76,15 @@ class RegionOfInterest:
         # Save name of the ROI. Create a generic, unambiguous one as default.
         self._name = None
         # Nametag for POIs. If you add a POI without explicitly setting a name, the name will be
-        # generated by using the nametag and appending it with consecutive integer numbers.
+        # generated by using the nametag (or "poi_" if not set) and appending it with consecutive
+        # integer numbers.
         self._poi_tag = None
-        # dictionary of POIs contained in this ROI with keys being the name
-        self._pois = dict()
+        # POIs contained in this ROI in struct-of-arrays layout: Names in order of addition, a
+        # lookup of the row index for each name and a float[N][3] buffer of POI anchors. Only the
+        # first len(self._poi_names) rows of the anchor buffer are valid.
+        self._poi_names = list()
+        self._poi_indices = dict()
+        self._poi_anchors = np.empty((8, 3), dtype=float)
 
         self.creation_time = creation_time
         self.name = name
@@ -118,15 +126,21 @@ class RegionOfInterest:
 
     @property
     def pos_history(self):
-        return np.array(self._pos_history, dtype=float)
+        # Read-only view of the valid buffer region. Rows handed out this way are never written to
+        # again since deleting entries always allocates a new buffer.
+        history = self._pos_history[:self._pos_history_size]
+        history.flags.writeable = False
+        return history
 
     @pos_history.setter
     def pos_history(self, new_history):
         if new_history is None:
             new_history = list()
-        self._pos_history = list(new_history)
-        if len(self._pos_history) == 0:
-            self._pos_history.append(np.zeros(4, dtype=float))
+        new_history = np.array(new_history, dtype=float).reshape(-1, 4)
+        if new_history.shape[0] == 0:
+            new_history = np.zeros((1, 4), dtype=float)
+        self._pos_history = new_history
+        self._pos_history_size = new_history.shape[0]
         return
 
     @property
@@ -149,7 +163,7 @@ class RegionOfInterest:
 
     @property
     def origin(self):
-        return np.array(self._pos_history[-1][1:], dtype=float)
+        return self._pos_history[self._pos_history_size - 1, 1:].copy()
 
     @property
     def scan_image(self):
@@ -170,54 +184,71 @@ class RegionOfInterest:
 
     @property
     def poi_names(self):
-        return list(self._pois)
+        return list(self._poi_names)
 
     @property
     def poi_positions(self):
-        origin = self.origin
-        return {name: poi.position + origin for name, poi in self._pois.items()}
+        return dict(zip(self._poi_names, self.poi_position_array))
 
     @property
     def poi_anchors(self):
-        return {name: poi.position for name, poi in self._pois.items()}
+        return dict(zip(self._poi_names, self.poi_anchor_array))
+
+    @property
+    def poi_position_array(self):
+        """ Absolute positions of all POIs as float[N][3] array (in order of poi_names).
+        """
+        return self._poi_anchors[:len(self._poi_names)] + self.origin
+
+    @property
+    def poi_anchor_array(self):
+        """ POI anchors relative to the initial ROI origin as float[N][3] array (in order of
+        poi_names).
+        """
+        return self._poi_anchors[:len(self._poi_names)].copy()
 
     def get_poi_position(self, name):
         if not isinstance(name, str):
             raise TypeError('POI name must be of type str.')
-        if name not in self._pois:
+        if name not in self._poi_indices:
             raise KeyError('No POI with name "{0}" found in POI list.'.format(name))
-        return self._pois[name].position + self.origin
+        return self._poi_anchors[self._poi_indices[name]] + self.origin
 
     def get_poi_anchor(self, name):
         if not isinstance(name, str):
             raise TypeError('POI name must be of type str.')
-        if name not in self._pois:
+        if name not in self._poi_indices:
             raise KeyError('No POI with name "{0}" found in POI list.'.format(name))
-        return self._pois[name].position
+        return self._poi_anchors[self._poi_indices[name]].copy()
 
     def set_poi_position(self, name, new_pos):
-        if name not in self._pois:
+        if name not in self._poi_indices:
             raise KeyError('POI with name "{0}" not found in ROI "{1}".\n'
                            'Unable to change POI position.'.format(name, self.name))
-        self._pois[name].position = np.array(new_pos, dtype=float) - self.origin
+        self.set_poi_anchor(name, np.array(new_pos, dtype=float) - self.origin)
         return
 
     def set_poi_anchor(self, name, new_pos):
-        if name not in self._pois:
+        if name not in self._poi_indices:
             raise KeyError('POI with name "{0}" not found in ROI "{1}".\n'
                            'Unable to change POI position.'.format(name, self.name))
-        self._pois[name].position = new_pos
+        if len(new_pos) != 3:
+            raise ValueError('POI position to set must be iterable of length 3 (X, Y, Z).')
+        self._poi_anchors[self._poi_indices[name]] = new_pos
         return
 
     def rename_poi(self, name, new_name=None):
         if new_name is not None and not isinstance(new_name, str):
             raise TypeError('POI name to set must be of type str or None.')
-        if name not in self._pois:
+        if name not in self._poi_indices:
             raise KeyError('Name "{0}" not found in POI list.'.format(name))
-        if new_name in self._pois:
+        if new_name in self._poi_indices:
             raise NameError('New POI name "{0}" already present in current POI list.')
-        self._pois[name].name = new_name
-        self._pois[new_name] = self._pois.pop(name)
+        if not new_name:
+            new_name = self._create_poi_name()
+        index = self._poi_indices.pop(name)
+        self._poi_names[index] = new_name
+        self._poi_indices[new_name] = index
         return
 
     def add_poi(self, position, name=None):
@@ -225,27 +256,55 @@ class RegionOfInterest:
             poi_inst = position
         else:
             position = position - self.origin
-            # Create a generic name from the poi_nametag if it is set and no name is given.
-            if name is None and self._poi_tag is not None:
-                tag_index = len(self._pois)
-                while True:
-                    tag_index += 1
-                    name = '{0}{1:d}'.format(self._poi_tag, tag_index)
-                    if name not in self._pois:
-                        break
             poi_inst = PointOfInterest(position=position, name=name)
-        if poi_inst.name in self._pois:
+        name = poi_inst.name
+        if name is None:
+            name = self._create_poi_name()
+        elif name in self._poi_indices:
             raise ValueError('POI with name "{0}" already present in ROI "{1}".\n'
-                             'Could not add POI to ROI'.format(poi_inst.name, self.name))
-        self._pois[poi_inst.name] = poi_inst
+                             'Could not add POI to ROI'.format(name, self.name))
+        index = len(self._poi_names)
+        if index == self._poi_anchors.shape[0]:
+            new_buffer = np.empty((2 * index, 3), dtype=float)
+            new_buffer[:index] = self._poi_anchors[:index]
+            self._poi_anchors = new_buffer
+        self._poi_anchors[index] = poi_inst.position
+        self._poi_names.append(name)
+        self._poi_indices[name] = index
         return
 
+    def _create_poi_name(self):
+        """ Create a generic POI name that is unique within this ROI from the poi_nametag (or
+        "poi_" if not set) and a consecutive integer number.
+        """
+        tag = 'poi_' if self._poi_tag is None else self._poi_tag
+        tag_index = len(self._poi_names)
+        while True:
+            tag_index += 1
+            name = '{0}{1:d}'.format(tag, tag_index)
+            if name not in self._poi_indices:
+                return name
+
     def delete_poi(self, name):
         if not isinstance(name, str):
             raise TypeError('POI name to delete must be of type str.')
-        if name not in self._pois:
+        if name not in self._poi_indices:
             raise KeyError('Name "{0}" not found in POI list.'.format(name))
-        del self._pois[name]
+        # Shift the following rows up by one to preserve the order of POIs
+        index = self._poi_indices.pop(name)
+        size = len(self._poi_names)
+        self._poi_anchors[index:size - 1] = self._poi_anchors[index + 1:size]
+        del self._poi_names[index]
+        for shifted_name in self._poi_names[index:]:
+            self._poi_indices[shifted_name] -= 1
+        return
+
+    def clear_pois(self):
+        """ Delete all POIs at once without shifting any rows.
+        """
+        self._poi_names = list()
+        self._poi_indices = dict()
+        self._poi_anchors = np.empty((8, 3), dtype=float)
         return
 
     def set_scan_image(self, image_arr, image_extent, scan_image_meta=None):
@@ -276,7 +335,13 @@ class RegionOfInterest:
         if len(new_pos) != 3:
             raise ValueError('ROI history position to set must be iterable of length 3 (X, Y, Z).')
         timedelta = datetime.now() - self.creation_time
-        self._pos_history.append(np.array((timedelta.total_seconds(), *new_pos), dtype=float))
+        size = self._pos_history_size
+        if size == self._pos_history.shape[0]:
+            new_buffer = np.empty((2 * size, 4), dtype=float)
+            new_buffer[:size] = self._pos_history[:size]
+            self._pos_history = new_buffer
+        self._pos_history[size] = (timedelta.total_seconds(), *new_pos)
+        self._pos_history_size = size + 1
         return
 
     def delete_history_entry(self, history_index=-1):
@@ -286,11 +351,11 @@ class RegionOfInterest:
         @param int|slice history_index: List index of history entry to delete
         """
         try:
-            del self._pos_history[history_index]
+            self.pos_history = np.delete(self._pos_history[:self._pos_history_size],
+                                         history_index,
+                                         axis=0)
         except IndexError:
             pass
-        if len(self._pos_history) == 0:
-            self._pos_history.append(np.zeros(4, dtype=float))
         return
 
     def to_dict(self):
@@ -301,7 +366,8 @@ class RegionOfInterest:
                 'scan_image': self.scan_image,
                 'scan_image_extent': self.scan_image_extent,
                 'scan_image_meta': self.scan_image_meta.to_dict() if self.scan_image_meta else None,
-                'pois': [poi.to_dict() for poi in self._pois.values()]}
+                'pois': [{'name': name, 'position': tuple(anchor)} for name, anchor in
+                         zip(self._poi_names, self._poi_anchors)]}
 
     @classmethod
     def from_dict(cls, dict_repr):
@@ -358,12 +424,13 @@ class ScanImageMeta:
 
 class PointOfInterest:
     """
-    The actual individual poi is saved in this generic object.
+    Representation of an individual POI used to add POIs to a RegionOfInterest and for
+    (de-)serialization. The ROI itself stores POIs in contiguous arrays.
     """
 
     def __init__(self, position, name=None):
-        # Name of the POI
-        self._name = ''
+        # Name of the POI. Unnamed POIs get a unique name when added to a RegionOfInterest.
+        self._name = None
         # Relative POI position within the ROI (x,y,z)
         self._position = np.zeros(3)
         # Initialize properties
@@ -372,16 +439,14 @@ class PointOfInterest:
 
     @property
     def name(self):
-        return str(self._name)
+        return self._name
 
     @name.setter
     def name(self, new_name):
         if new_name is not None and not isinstance(new_name, str):
             raise TypeError('Name to set must be either None or of type str.')
 
-        if not new_name:
-            new_name = datetime.now().strftime('poi_%Y%m%d%H%M%S%f')
-        self._name = str(new_name)
+        self._name = str(new_name) if new_name else None
         return
 
     @property
@@ -528,6 +593,10 @@ class PoiManagerLogic(LogicBase):
     def poi_positions(self):
         return self._roi.poi_positions
 
+    @property
+    def poi_position_array(self):
+        return self._roi.poi_position_array
+
     @property
     def poi_anchors(self):
         return self._roi.poi_anchors
@@ -716,8 +785,9 @@ class PoiManagerLogic(LogicBase):
     def delete_all_pois(self):
         with self._thread_lock:
             self.active_poi = None
-            for name in self.poi_names:
-                self._roi.delete_poi(name)
+            names = self.poi_names
+            self._roi.clear_pois()
+            for name in names:
                 self.sigPoiUpdated.emit(name, '', np.zeros(3))
             return
 
@@ -1210,16 +1280,22 @@ class PoiManagerLogic(LogicBase):
             return
         filepath, filename = os.path.split(complete_path)
 
+        # Read the file header (leading comment lines) only once. It is used for both format
+        # detection and metadata parsing.
+        header_lines = list()
+        with open(complete_path, 'r') as file:
+            for line in file:
+                if not line.startswith('#'):
+                    break
+                header_lines.append(line)
+
         # Try to detect legacy file format
         is_legacy_format = False
         if not complete_path.endswith('_poi_list.dat'):
             self.log.info('Trying to read ROI from legacy file format...')
-            with open(complete_path, 'r') as file:
-                for line in file.readlines():
-                    if line.strip() == '#POI Name\tPOI Key\tX\tY\tZ':
-                        is_legacy_format = True
-                    elif not line.startswith('#'):
-                        break
+            is_legacy_format = any(
+                line.strip() == '#POI Name\tPOI Key\tX\tY\tZ' for line in header_lines
+            )
             if not is_legacy_format:
                 self.log.error('Unable to load ROI from file. File format not understood.')
                 return
@@ -1229,12 +1305,15 @@ class PoiManagerLogic(LogicBase):
         else:
             filetag = filename.rsplit('_poi_list.dat', 1)[0]
 
-        # Read POI data as well as roi metadata from textfile
-        poi_names = np.loadtxt(complete_path, delimiter='\t', usecols=0, dtype=str, ndmin=1)
-        if is_legacy_format:
-            poi_coords = np.loadtxt(complete_path, delimiter='\t', usecols=(2, 3, 4), dtype=float, ndmin=2)
-        else:
-            poi_coords = np.loadtxt(complete_path, delimiter='\t', usecols=(1, 2, 3), dtype=float, ndmin=2)
+        # Read POI names and coordinates from textfile in a single pass
+        coord_columns = (2, 3, 4) if is_legacy_format else (1, 2, 3)
+        poi_data = np.loadtxt(complete_path,
+                              delimiter='\t',
+                              usecols=(0, *coord_columns),
+                              dtype=str,
+                              ndmin=2)
+        poi_names = poi_data[:, 0]
+        poi_coords = poi_data[:, 1:].astype(float)
 
         # Create list of POI instances
         poi_list = [PointOfInterest(pos, poi_names[i]) for i, pos in enumerate(poi_coords)]
@@ -1246,22 +1325,19 @@ class PoiManagerLogic(LogicBase):
         if is_legacy_format:
             roi_name = filetag
         else:
-            with open(complete_path, 'r') as file:
-                for line in file.readlines():
-                    if not line.startswith('#'):
-                        break
-                    if line.startswith('# roi_name='):
-                        roi_name = line.split('# roi_name=', 1)[1].strip().split("'")[1]
-                    elif line.startswith('# poi_nametag='):
-                        poi_nametag = line.split('# poi_nametag=', 1)[1].strip().split("'")[1]
-                    elif line.startswith('# roi_creation_time='):
-                        roi_creation_time = line.split('# roi_creation_time=', 1)[1].strip().split("'")[1]
-                    elif line.startswith('# scan_image_x_extent='):
-                        scan_x_extent = line.split('# scan_image_x_extent=', 1)[1].strip().split("'")[1].strip().split(
-                            ',')
-                    elif line.startswith('# scan_image_y_extent='):
-                        scan_y_extent = line.split('# scan_image_y_extent=', 1)[1].strip().split("'")[1].strip().split(
-                            ',')
+            for line in header_lines:
+                if line.startswith('# roi_name='):
+                    roi_name = line.split('# roi_name=', 1)[1].strip().split("'")[1]
+                elif line.startswith('# poi_nametag='):
+                    poi_nametag = line.split('# poi_nametag=', 1)[1].strip().split("'")[1]
+                elif line.startswith('# roi_creation_time='):
+                    roi_creation_time = line.split('# roi_creation_time=', 1)[1].strip().split("'")[1]
+                elif line.startswith('# scan_image_x_extent='):
+                    scan_x_extent = line.split('# scan_image_x_extent=', 1)[1].strip().split("'")[1].strip().split(
+                        ',')
+                elif line.startswith('# scan_image_y_extent='):
+                    scan_y_extent = line.split('# scan_image_y_extent=', 1)[1].strip().split("'")[1].strip().split(
+                        ',')
 
             if scan_x_extent is not None and scan_y_extent is not None:
                 scan_extent = ((float(scan_x_extent[0]), float(scan_x_extent[1])),
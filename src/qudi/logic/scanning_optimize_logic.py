@@ -88,6 +88,10 @@ class ScanningOptimizeLogic(LogicBase):
         self._avail_axes = tuple()
         self._stashed_settings = None
 
+        # fit models are stateless, so construct them only once instead of for every fit
+        self._gauss_1d_model = Gaussian()
+        self._gauss_2d_model = Gaussian2D()
+
     def on_activate(self):
         """Initialisation performed during activation of the module."""
         scan_logic: ScanningProbeLogic = self._scan_logic()
@@ -404,7 +408,7 @@ class ScanningOptimizeLogic(LogicBase):
                 self.sigOptimizeStateChanged.emit(False, dict(), None)
 
     def _get_pos_from_2d_gauss_fit(self, xy, data):
-        model = Gaussian2D()
+        model = self._gauss_2d_model
 
         try:
             fit_result = model.fit(data, x=xy, **model.estimate_peak(data, xy))
@@ -423,7 +427,7 @@ class ScanningOptimizeLogic(LogicBase):
         )
 
     def _get_pos_from_1d_gauss_fit(self, x, data):
-        model = Gaussian()
+        model = self._gauss_1d_model
 
         try:
             fit_result = model.fit(data, x=x, **model.estimate_peak(data, x))
@@ -716,11 +716,9 @@ class TimeSeriesReaderLogic(LogicBase):
                 [self._recorded_sample_count, channel_count]
             )
             if self._recorded_raw_times is not None:
-                print(data.shape)
                 data = np.column_stack(
                     [self._recorded_raw_times[:self._recorded_sample_count], data]
                 )
-                print(data.shape, '\n')
                 column_headers.insert(0, 'Time (s)')
             try:
                 fig = self._draw_raw_data_thumbnail(data) if save_figure else None
@@ -742,7 +740,6 @@ class TimeSeriesReaderLogic(LogicBase):
         # Handle excessive data size for plotting. Artefacts may occur due to IIR decimation filter.
         decimate_factor = 0
         while data.shape[0] >= 20000:
-            print(data.shape[0])
             decimate_factor += 2
             data = decimate(data, q=2, axis=0)
 
@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from qudi.logic.poi_manager_logic import RegionOfInterest, PointOfInterest, ScanImageMeta
+
+
+@pytest.fixture
+def roi():
+    roi = RegionOfInterest(name='roi', poi_nametag='poi_')
+    for i in range(5):
+        roi.add_poi(np.array([i, 2 * i, 3 * i], dtype=float))
+    return roi
+
+
+def test_add_poi(roi):
+    assert roi.poi_names == ['poi_1', 'poi_2', 'poi_3', 'poi_4', 'poi_5']
+    np.testing.assert_array_equal(roi.get_poi_anchor('poi_3'), [2, 4, 6])
+    np.testing.assert_array_equal(roi.poi_anchor_array[:, 0], np.arange(5))
+    with pytest.raises(ValueError):
+        roi.add_poi(np.zeros(3), name='poi_1')
+
+
+def test_add_unnamed_point_of_interest(roi):
+    poi = PointOfInterest(np.ones(3))
+    assert poi.name is None
+    roi.add_poi(poi)
+    roi.add_poi(PointOfInterest.from_dict({'position': (2, 2, 2)}))
+    assert roi.poi_names[5:] == ['poi_6', 'poi_7']
+    np.testing.assert_array_equal(roi.get_poi_anchor('poi_7'), [2, 2, 2])
+
+
+def test_poi_positions_follow_origin(roi):
+    roi.add_history_entry((1, 1, 1))
+    np.testing.assert_array_equal(roi.get_poi_position('poi_2'), [2, 3, 4])
+    np.testing.assert_array_equal(roi.get_poi_anchor('poi_2'), [1, 2, 3])
+    roi.add_poi(np.array([1, 1, 1], dtype=float), name='new')
+    np.testing.assert_array_equal(roi.get_poi_anchor('new'), [0, 0, 0])
+
+
+def test_delete_poi(roi):
+    roi.delete_poi('poi_2')
+    assert roi.poi_names == ['poi_1', 'poi_3', 'poi_4', 'poi_5']
+    np.testing.assert_array_equal(roi.poi_anchor_array[:, 0], [0, 2, 3, 4])
+    np.testing.assert_array_equal(roi.get_poi_anchor('poi_5'), [4, 8, 12])
+    with pytest.raises(KeyError):
+        roi.get_poi_anchor('poi_2')
+    # new generic names must not clash with existing ones
+    roi.add_poi(np.zeros(3))
+    assert len(set(roi.poi_names)) == 5
+
+
+def test_clear_pois(roi):
+    roi.clear_pois()
+    assert roi.poi_names == []
+    assert roi.poi_anchor_array.shape == (0, 3)
+    roi.add_poi(np.ones(3), name='a')
+    np.testing.assert_array_equal(roi.get_poi_anchor('a'), [1, 1, 1])
+
+
+def test_rename_poi(roi):
+    roi.rename_poi('poi_3', 'renamed')
+    assert roi.poi_names[2] == 'renamed'
+    np.testing.assert_array_equal(roi.get_poi_anchor('renamed'), [2, 4, 6])
+    with pytest.raises(KeyError):
+        roi.get_poi_anchor('poi_3')
+    with pytest.raises(NameError):
+        roi.rename_poi('poi_1', 'renamed')
+    roi.rename_poi('renamed')
+    assert roi.poi_names[2] not in ('renamed', 'poi_1', 'poi_2', 'poi_4', 'poi_5')
+
+
+def test_poi_buffer_growth():
+    roi = RegionOfInterest()
+    for i in range(20):
+        roi.add_poi(np.array([i, 0, 0], dtype=float), name=f'p{i}')
+    assert len(roi.poi_names) == 20
+    np.testing.assert_array_equal(roi.poi_anchor_array[:, 0], np.arange(20))
+    roi.delete_poi('p0')
+    np.testing.assert_array_equal(roi.poi_anchor_array[:, 0], np.arange(1, 20))
+    np.testing.assert_array_equal(roi.get_poi_anchor('p19'), [19, 0, 0])
+
+
+def test_history_buffer_growth():
+    roi = RegionOfInterest()
+    for i in range(1, 21):
+        roi.add_history_entry((i, i, i))
+    history = roi.pos_history
+    assert history.shape == (21, 4)
+    assert not history.flags.writeable
+    np.testing.assert_array_equal(roi.origin, [20, 20, 20])
+
+
+def test_delete_history_entry():
+    roi = RegionOfInterest()
+    for i in range(1, 4):
+        roi.add_history_entry((i, i, i))
+    roi.delete_history_entry()
+    assert roi.pos_history.shape == (3, 4)
+    np.testing.assert_array_equal(roi.origin, [2, 2, 2])
+    roi.delete_history_entry(1)
+    np.testing.assert_array_equal(roi.pos_history[:, 1], [0, 2])
+    # invalid indices are ignored
+    roi.delete_history_entry(100)
+    assert roi.pos_history.shape == (2, 4)
+    # deleting everything falls back to the initial origin
+    roi.delete_history_entry(slice(None))
+    np.testing.assert_array_equal(roi.pos_history, np.zeros((1, 4)))
+
+
+def test_dict_round_trip(roi):
+    roi.add_history_entry((1, 2, 3))
+    roi.set_scan_image(np.arange(4).reshape(2, 2), ((0, 1), (0, 1)), ScanImageMeta(x_unit='m'))
+    new_roi = RegionOfInterest.from_dict(roi.to_dict())
+    assert new_roi.name == roi.name
+    assert new_roi.poi_nametag == roi.poi_nametag
+    assert new_roi.creation_time == roi.creation_time
+    assert new_roi.poi_names == roi.poi_names
+    assert new_roi.scan_image_meta == roi.scan_image_meta
+    np.testing.assert_array_equal(new_roi.pos_history, roi.pos_history)
+    np.testing.assert_array_equal(new_roi.poi_anchor_array, roi.poi_anchor_array)
+    np.testing.assert_array_equal(new_roi.scan_image, roi.scan_image)